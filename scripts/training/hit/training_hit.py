@@ -20,6 +20,7 @@ import shutil
 import sys
 
 import click
+import torch
 from deeponto.utils import create_path, load_file, set_seed
 from sentence_transformers.training_args import SentenceTransformerTrainingArguments
 from yacs.config import CfgNode
@@ -54,6 +55,8 @@ def main(config_file: str):
     triplet_dataset = load_hf_dataset(config.dataset_path, config.dataset_name + "-Triplets")
     pair_dataset = load_hf_dataset(config.dataset_path, config.dataset_name + "-Pairs")
     model = HierarchyTransformer.from_pretrained(model_name_or_path=config.model_path)
+    # optional reduced precision (e.g., "bfloat16") for the evaluators' encoder forward pass on CUDA
+    autocast_dtype = getattr(torch, config.autocast_dtype) if config.get("autocast_dtype") else None
 
     # 2. set up the loss function
     hit_loss = HierarchyTransformerLoss(
@@ -72,6 +75,7 @@ def main(config_file: str):
         labels=pair_dataset["val"]["label"],
         batch_size=config.eval_batch_size,
         truth_label=1,
+        autocast_dtype=autocast_dtype,
     )
 
     # 4. Define the training arguments
@@ -113,6 +117,7 @@ def main(config_file: str):
         labels=pair_dataset["test"]["label"],
         batch_size=config.eval_batch_size,
         truth_label=1,
+        autocast_dtype=autocast_dtype,
     )
     test_evaluator(
         model=model,
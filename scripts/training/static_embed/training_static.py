@@ -72,6 +72,7 @@ def main(config_file: str, gpu_id: int):
         learning_rate=float(config.learning_rate),
         train_batch_size=int(config.train_batch_size),
         warmup_epochs=int(config.warmup_epochs),
+        compile_mode=config.get("compile_mode", None),
     )
     trainer.train(device=device)
     torch.save(trainer.model, os.path.join(output_dir, "poincare_static.pt"))
@@ -115,6 +116,7 @@ def main(config_file: str, gpu_id: int):
             learning_rate=float(config.learning_rate),
             train_batch_size=int(config.train_batch_size),
             warmup_epochs=int(config.warmup_epochs),
+            compile_mode=config.get("compile_mode", None),
         )
         post_trainer.train(device=device)
         torch.save(post_trainer.model, os.path.join(output_dir, "hypercone_static.pt"))
@@ -29,18 +29,32 @@ class HierarchyDatasetConstructor:
     def __init__(self, hierarchy: Taxonomy):
         self.hierarchy = hierarchy
         self.neg_sampler = TaxonomyNegativeSampler(self.hierarchy)
+        # an entity appears in as many examples as it has parents, so taxonomy lookups are cached
+        self._ancestors = dict()
+        self._hard_negatives = dict()
+        self._entity_lexicon = None
+
+    def get_ancestors(self, entity_id: str):
+        """
+        Get all (direct and indirect) subsumers of the input entity.
+        """
+        if entity_id not in self._ancestors:
+            self._ancestors[entity_id] = self.hierarchy.get_parents(entity_id, True)
+        return self._ancestors[entity_id]
 
     def get_hard_negative(self, entity_id: str):
         """
         Get a hard negative subsumer (sibling) for the input entity.
         """
-        parents = self.hierarchy.get_parents(entity_id)
-        ancestors = self.hierarchy.get_parents(entity_id, True)
-        siblings = []
-        for parent in parents:
-            siblings += self.hierarchy.get_children(parent)
-        hard_negatives = set(siblings) - set([entity_id]) - set(ancestors)
-        return list(hard_negatives)
+        if entity_id not in self._hard_negatives:
+            parents = self.hierarchy.get_parents(entity_id)
+            ancestors = self.get_ancestors(entity_id)
+            siblings = []
+            for parent in parents:
+                siblings += self.hierarchy.get_children(parent)
+            hard_negatives = set(siblings) - set([entity_id]) - set(ancestors)
+            self._hard_negatives[entity_id] = list(hard_negatives)
+        return self._hard_negatives[entity_id]
 
     def get_transitive_edges(self, edges: list):
         """
@@ -48,17 +62,22 @@ class HierarchyDatasetConstructor:
         """
         trans_edges = []
         for child, _ in edges:
-            trans_edges += [(child, parent) for parent in self.hierarchy.get_parents(child, True)]
+            trans_edges += [(child, parent) for parent in self.get_ancestors(child)]
         return list(set(trans_edges) - set(edges))
 
+    def get_entity_lexicon(self):
+        """
+        Get the entity lexicon (built once for all tasks).
+        """
+        if self._entity_lexicon is None:
+            self._entity_lexicon = {n: self.hierarchy.get_node_attributes(n) for n in self.hierarchy.nodes}
+        return self._entity_lexicon
+
     def save_entity_lexicon(self, output_dir: str):
         """
         Save the entity lexicon.
         """
-        entity_lexicon = dict()
-        for n in self.hierarchy.nodes:
-            entity_lexicon[n] = self.hierarchy.get_node_attributes(n)
-        save_file(entity_lexicon, f"{output_dir}/entity_lexicon.json")
+        save_file(self.get_entity_lexicon(), f"{output_dir}/entity_lexicon.json")
 
     def save_dataset(self, dataset: list, output_file: str):
         """
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import logging
 import os
+from collections import defaultdict
 
 from datasets import Dataset, load_dataset
 from tqdm import tqdm
@@ -84,13 +85,12 @@ def load_zenodo_dataset(
                 for example in tqdm(examples, desc=f"Map ({split})", leave=True)
             ]
         else:
-            # for other models, inputs are flattened
-            dataset_split = [
-                transformed
-                for example in tqdm(examples, desc=f"Map ({split})", leave=True)
-                for transformed in transform(example, negative_type, entity_lexicon_or_index)
-            ]
-            dataset_split = Dataset.from_list(dataset_split)
+            # for other models, inputs are flattened and collected column-wise
+            columns = defaultdict(list)
+            for example in tqdm(examples, desc=f"Map ({split})", leave=True):
+                for column, values in transform(example, negative_type, entity_lexicon_or_index).items():
+                    columns[column] += values
+            dataset_split = Dataset.from_dict(columns)
 
         dataset[split] = dataset_split
 
@@ -98,25 +98,35 @@ def load_zenodo_dataset(
 
 
 def zenodo_example_to_triplets(example: dict, negative_type: str, entity_lexicon: dict):
-    """Helper function to present Zenodo dataset examples into triplets of the form `(child, parent, negative)`."""
+    """Helper function to present Zenodo dataset examples into triplets of the form `(child, parent, negative)`.
+
+    The triplets are returned column-wise, i.e., as a dictionary of `child`, `parent`, and `negative` lists.
+    """
 
     child = entity_lexicon[example["child"]]["name"]
     parent = entity_lexicon[example["parent"]]["name"]
     negative_type = f"{negative_type}_negatives"
     negative_parents = [entity_lexicon[neg]["name"] for neg in example[negative_type]]
-    return [{"child": child, "parent": parent, "negative": neg} for neg in negative_parents]
+    num_negatives = len(negative_parents)
+    return {"child": [child] * num_negatives, "parent": [parent] * num_negatives, "negative": negative_parents}
 
 
 def zenodo_example_to_pairs(example: dict, negative_type: str, entity_lexicon: dict):
-    """Helper function to present Zenodo dataset examples into labelled pairs of the form `(child, parent, label)`."""
+    """Helper function to present Zenodo dataset examples into labelled pairs of the form `(child, parent, label)`.
+
+    The pairs are returned column-wise, i.e., as a dictionary of `child`, `parent`, and `label` lists.
+    """
 
     child = entity_lexicon[example["child"]]["name"]
     parent = entity_lexicon[example["parent"]]["name"]
     negative_type = f"{negative_type}_negatives"
     negative_parents = [entity_lexicon[neg]["name"] for neg in example[negative_type]]
-    return [{"child": child, "parent": parent, "label": 1}] + [
-        {"child": child, "parent": neg, "label": 0} for neg in negative_parents
-    ]
+    num_negatives = len(negative_parents)
+    return {
+        "child": [child] * (1 + num_negatives),
+        "parent": [parent] + negative_parents,
+        "label": [1] + [0] * num_negatives,
+    }
 
 
 def zenodo_example_to_idxs(example: dict, negative_type: str, entity_to_indices: dict):
@@ -16,12 +16,14 @@ from __future__ import annotations
 import logging
 import os.path
 import warnings
+from contextlib import nullcontext
 
 import pandas as pd
 import torch
 from sentence_transformers.evaluation import SentenceEvaluator
 
 from hierarchy_transformers import HierarchyTransformer
+from hierarchy_transformers.models.hierarchy_transformer.hyperbolic import poincare_dists
 
 from .metrics import evaluate_by_threshold, grid_search
 
@@ -41,6 +43,7 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
         labels (list[int]): List of reference labels.
         batch_size (int): Evaluation batch size.
         truth_label (int, optional): Specify which label represents the truth. Defaults to `1`.
+        autocast_dtype (torch.dtype, optional): Reduced precision (e.g., `torch.bfloat16`) for the encoder forward pass on CUDA devices; the embeddings are kept in `float32` for hyperbolic distances. Defaults to `None` (full precision).
     """
 
     def __init__(
@@ -50,6 +53,7 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
         labels: list[int],
         batch_size: int,
         truth_label: int = 1,
+        autocast_dtype: torch.dtype | None = None,
     ):
         super().__init__()
         # set primary metric for model selection
@@ -58,16 +62,75 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
         self.child_entities = child_entities
         self.parent_entities = parent_entities
         self.labels = labels
+        # entity names are repeated across examples (e.g., a child with its parent and negatives)
+        # so only the unique ones need encoding
+        self.unique_entities = list(dict.fromkeys(list(child_entities) + list(parent_entities)))
+        entity_to_index = {entity: idx for idx, entity in enumerate(self.unique_entities)}
+        self.child_indices = torch.tensor([entity_to_index[entity] for entity in child_entities])
+        self.parent_indices = torch.tensor([entity_to_index[entity] for entity in parent_entities])
+        # tokenised batches of unique entities are reused across evaluation calls (e.g., at every epoch)
+        self._tokenized_batches = dict()
         # eval batch size
         self.batch_size = batch_size
         # truth reference label
         self.truth_label = truth_label
+        # mixed precision for encoding
+        self.autocast_dtype = autocast_dtype
         # result file
         self.results = pd.DataFrame(
             columns=["centri_weight", "threshold", "precision", "recall", "f1", "accuracy", "accuracy_on_negatives"]
         )
         # NOTE: static transformation staticmethod to do
 
+    def tokenize(self, model: HierarchyTransformer):
+        """Tokenise the unique entities into length-sorted batches of `(entity_indices, features)`.
+
+        The tokenised batches are cached per tokenizer so that repetitive evaluation does not re-tokenise the same entities.
+        """
+        cache_key = (model.tokenizer.name_or_path, model.max_seq_length)
+        if cache_key not in self._tokenized_batches:
+            logger.info("Tokenise child and parent entities.")
+            # sort by length (longest first) to reduce padding as in `SentenceTransformer.encode`
+            sorted_indices = sorted(range(len(self.unique_entities)), key=lambda i: -len(self.unique_entities[i]))
+            batches = []
+            for start in range(0, len(sorted_indices), self.batch_size):
+                batch_indices = sorted_indices[start : start + self.batch_size]
+                features = model.tokenize([self.unique_entities[i] for i in batch_indices])
+                batch_indices = torch.tensor(batch_indices)
+                # pinned host memory allows asynchronous copies to GPU during encoding
+                if torch.cuda.is_available():
+                    features = {key: value.pin_memory() for key, value in features.items()}
+                    batch_indices = batch_indices.pin_memory()
+                batches.append((batch_indices, features))
+            self._tokenized_batches[cache_key] = batches
+        return self._tokenized_batches[cache_key]
+
+    def encode(self, model: HierarchyTransformer):
+        """Encode the unique entities once and gather the embeddings of child and parent entities."""
+        tokenized_batches = self.tokenize(model)
+        logger.info("Encode child and parent entities.")
+        model.eval()
+        if self.autocast_dtype is not None and model.device.type == "cuda":
+            autocast = torch.autocast(device_type="cuda", dtype=self.autocast_dtype)
+        else:
+            autocast = nullcontext()
+        with torch.inference_mode(), autocast:
+            # embeddings are written into a `float32` buffer even if the forward pass is autocast
+            entity_embeds = torch.empty(
+                (len(self.unique_entities), model.get_sentence_embedding_dimension()),
+                dtype=torch.float32,
+                device=model.device,
+            )
+            for batch_indices, features in tokenized_batches:
+                features = {key: value.to(model.device, non_blocking=True) for key, value in features.items()}
+                batch_indices = batch_indices.to(model.device, non_blocking=True)
+                # index assignment requires matching dtypes, so reduced precision outputs are cast back
+                batch_embeds = model(features)["sentence_embedding"].to(entity_embeds.dtype)
+                entity_embeds[batch_indices] = batch_embeds
+        child_embeds = entity_embeds[self.child_indices.to(entity_embeds.device)]
+        parent_embeds = entity_embeds[self.parent_indices.to(entity_embeds.device)]
+        return child_embeds, parent_embeds
+
     def inference(
         self,
         model: HierarchyTransformer,
@@ -79,20 +142,20 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
 
         Optional `child_embeds` and `parent_embeds` are used to save time from repetitive encoding.
         """
-        if child_embeds is None:
-            logger.info("Encode child entities.")
-            child_embeds = model.encode(
-                sentences=self.child_entities, batch_size=self.batch_size, convert_to_tensor=True
-            )
-        if parent_embeds is None:
-            logger.info("Encode parent entities.")
-            parent_embeds = model.encode(
-                sentences=self.parent_entities, batch_size=self.batch_size, convert_to_tensor=True
-            )
-        dists = model.manifold.dist(child_embeds, parent_embeds)
-        child_norms = model.manifold.dist0(child_embeds)
-        parent_norms = model.manifold.dist0(parent_embeds)
-        return -(dists + centri_weight * (parent_norms - child_norms))
+        if child_embeds is None or parent_embeds is None:
+            encoded_child_embeds, encoded_parent_embeds = self.encode(model)
+            child_embeds = encoded_child_embeds if child_embeds is None else child_embeds
+            parent_embeds = encoded_parent_embeds if parent_embeds is None else parent_embeds
+        dists, child_norms, parent_norms = poincare_dists(child_embeds, parent_embeds, float(model.manifold.c))
+        return self.score(dists, parent_norms - child_norms, centri_weight)
+
+    @staticmethod
+    def score(dists: torch.Tensor, norm_diffs: torch.Tensor, centri_weight: float):
+        """Combine the hyperbolic distances and the differences of hyperbolic norms (parent minus child) into scores.
+
+        Both inputs are contiguous 1-D tensors computed once per evaluation and shared across centripetal score weights.
+        """
+        return -(dists + centri_weight * norm_diffs)
 
     def __call__(
         self,
@@ -122,12 +185,11 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
             type(best_centri_weight) is type(best_threshold)
         ), "Inconsistent types of hyperparameters 'best_centri_weight' (centripetal score weight) and 'best_threshold' (overall threshold)"
 
-        logger.info("Encode child entities.")
-        child_embeds = model.encode(sentences=self.child_entities, batch_size=self.batch_size, convert_to_tensor=True)
-        logger.info("Encode parent entities.")
-        parent_embeds = model.encode(
-            sentences=self.parent_entities, batch_size=self.batch_size, convert_to_tensor=True
-        )
+        child_embeds, parent_embeds = self.encode(model)
+        # distances and norms do not depend on the centripetal score weight so they are computed only once
+        dists, child_norms, parent_norms = poincare_dists(child_embeds, parent_embeds, float(model.manifold.c))
+        norm_diffs = parent_norms - child_norms
+        labels = torch.tensor(self.labels).to(dists.device)
 
         if best_centri_weight and best_threshold:
             # Testing with pre-defined hyperparameters
@@ -136,19 +198,14 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
             )
 
             # Compute the scores
-            scores = self.inference(
-                model=model,
-                centri_weight=best_centri_weight,
-                child_embeds=child_embeds,
-                parent_embeds=parent_embeds,
-            )
+            scores = self.score(dists, norm_diffs, best_centri_weight)
 
             # Compute the evaluation metrics
             best_results = {"centri_weight": best_centri_weight}
             best_results.update(
                 evaluate_by_threshold(
                     scores=scores,
-                    labels=torch.tensor(self.labels).to(scores.device),
+                    labels=labels,
                     threshold=best_threshold,
                     truth_label=self.truth_label,
                     smaller_scores_better=False,
@@ -179,14 +236,12 @@ class HierarchyTransformerEvaluator(SentenceEvaluator):
                 centri_weight /= 10
 
                 # Compute the scores
-                scores = self.inference(
-                    model=model, centri_weight=centri_weight, child_embeds=child_embeds, parent_embeds=parent_embeds
-                )
+                scores = self.score(dists, norm_diffs, centri_weight)
 
                 # Perform grid search on hyperparameters
                 cur_best_results = grid_search(
                     scores=scores,
-                    labels=torch.tensor(self.labels).to(scores.device),
+                    labels=labels,
                     threshold_granularity=100,
                     truth_label=self.truth_label,
                     smaller_scores_better=False,
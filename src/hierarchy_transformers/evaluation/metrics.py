@@ -16,7 +16,6 @@ from __future__ import annotations
 import math
 
 import torch
-from tqdm import tqdm
 
 
 def f1_score(predictions: torch.Tensor, labels: torch.Tensor, truth_label: int = 1):
@@ -86,6 +85,59 @@ def evaluate_by_threshold(
     return results
 
 
+def threshold_sweep(
+    scores: torch.Tensor,
+    labels: torch.Tensor,
+    thresholds: torch.Tensor,
+    truth_label: int = 1,
+    smaller_scores_better: bool = False,
+):
+    r"""Compute evaluation metrics (`Precision`, `Recall`, `F1`, `Accurarcy`, `Accurarcy-`) for many thresholds at once.
+
+    Scores are sorted once and the confusion counts of every threshold are read off cumulative sums over the sorted labels,
+    which gives the same values as calling `evaluate_by_threshold` on each threshold separately.
+
+    Args:
+        scores (torch.Tensor): Prediction scores.
+        labels (torch.Tensor): Reference labels (`0` or `1`).
+        thresholds (torch.Tensor): Thresholds that split the positive and negative predictions.
+        truth_label (int): Specify which label represents the truth. Defaults to `1`.
+        smaller_scores_better (bool): Specify if smaller than threshold indicates positive or not. Defaults to `False`.
+
+    Returns:
+        results (dict): result dictionary mapping each metric name to a tensor of values aligned with `thresholds`.
+    """
+    sorted_scores, order = scores.sort()
+    is_truth = (labels == truth_label)[order]
+    cum_truth = torch.cat([is_truth.new_zeros(1, dtype=torch.long), is_truth.cumsum(dim=0)])
+    num_examples = len(labels)
+    num_truth = cum_truth[-1]
+
+    # number of scores <= threshold
+    num_below = torch.searchsorted(sorted_scores, thresholds.to(sorted_scores), right=True)
+    # predictions are `scores > threshold` (or `scores <= threshold`) and compared against `truth_label`
+    if smaller_scores_better != (truth_label == 1):
+        tp = num_truth - cum_truth[num_below]
+        num_predicted = num_examples - num_below
+    else:
+        tp = cum_truth[num_below]
+        num_predicted = num_below
+    fp = num_predicted - tp
+    fn = num_truth - tp
+    tn = num_examples - num_truth - fp
+
+    precision = tp / (tp + fp)
+    recall = tp / (tp + fn)
+    f1 = 2 * (precision * recall) / (precision + recall)
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "accuracy": (tp + tn) / num_examples,
+        "accuracy_on_negatives": tn / (tn + fp),
+    }
+
+
 def grid_search(
     scores: torch.Tensor,
     labels: torch.Tensor,
@@ -114,20 +166,36 @@ def grid_search(
     # grid search start and end are confined by the prediction scores
     start = int(scores.min() * threshold_granularity)
     end = int(scores.max() * threshold_granularity)
-
-    # grid search to update the best results
-    for threshold in tqdm(range(start, end), desc="Thresholding"):
-        threshold = threshold / threshold_granularity
-        results = evaluate_by_threshold(
-            scores=scores,
-            labels=labels,
-            threshold=threshold,
-            truth_label=truth_label,
-            smaller_scores_better=smaller_scores_better,
+    if end <= start:
+        return best_results
+
+    # sweep all thresholds at once using cumulative counts over the sorted scores
+    thresholds = (torch.arange(start, end, dtype=torch.float64) / threshold_granularity).to(scores)
+    metrics = threshold_sweep(
+        scores=scores,
+        labels=labels,
+        thresholds=thresholds,
+        truth_label=truth_label,
+        smaller_scores_better=smaller_scores_better,
+    )[primary_metric]
+
+    # NaN values (e.g., no positive predictions) never count as improvements
+    is_valid = ~metrics.isnan()
+    if not is_valid.any():
+        return best_results
+    best_value = metrics[is_valid].max()
+    if best_value.item() >= best_primary_metric_value:
+        # the last threshold reaching the best value is kept, consistent with a sequential `>=` update
+        best_idx = int((metrics == best_value).nonzero()[-1])
+        best_results = preformatted_best_results
+        best_results.update(
+            evaluate_by_threshold(
+                scores=scores,
+                labels=labels,
+                threshold=(start + best_idx) / threshold_granularity,
+                truth_label=truth_label,
+                smaller_scores_better=smaller_scores_better,
+            )
         )
-        if results[primary_metric] >= best_primary_metric_value:
-            best_results = preformatted_best_results
-            best_results.update(results)
-            best_primary_metric_value = results[primary_metric]
 
     return best_results
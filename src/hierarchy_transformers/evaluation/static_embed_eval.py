@@ -86,18 +86,19 @@ class PoincareStaticEmbeddingEvaluator:
         # make predictions
         dataloader = DataLoader(torch.tensor(self.examples).to(device), shuffle=False, batch_size=self.batch_size)
         num_negatives = len(self.examples[0]) - 2  # each example is formatted as [child, parent, *negatives]
-        scores = []
-        labels = []
-        with torch.no_grad():
+        offset = 0
+        with torch.inference_mode():
+            # preallocate the score buffer and fill it batch by batch
+            scores = torch.empty((len(self.examples), 1 + num_negatives), device=device)
             for batch in dataloader:
                 subject, objects = model(batch)
-                cur_scores = score_func(subject, objects)
-                scores.append(cur_scores.reshape((-1,)))
-        scores = torch.concat(scores, dim=0)
-        labels = torch.tensor(
-            ([self.truth_label] + [1 - self.truth_label] * num_negatives) * (int(len(scores) / (1 + num_negatives)))
-        ).to(scores.device)
-        assert len(labels) == len(scores)
+                scores[offset : offset + len(batch)] = score_func(subject, objects)
+                offset += len(batch)
+        # each row of scores is [positive, *negatives]
+        labels = torch.full_like(scores, 1 - self.truth_label, dtype=torch.long)
+        labels[:, 0] = self.truth_label
+        scores = scores.reshape((-1,))
+        labels = labels.reshape((-1,))
 
         return scores, labels
 
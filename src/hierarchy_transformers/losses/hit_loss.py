@@ -21,6 +21,11 @@ import torch.nn.functional as F
 from geoopt.manifolds import PoincareBall
 
 from hierarchy_transformers.models import HierarchyTransformer
+from hierarchy_transformers.models.hierarchy_transformer.hyperbolic import (
+    poincare_dist,
+    poincare_dist0,
+    poincare_dists,
+)
 from hierarchy_transformers.utils import format_citation
 
 logger = logging.getLogger(__name__)
@@ -41,6 +46,7 @@ class HierarchyTransformerLoss(torch.nn.Module):
 
         self.model = model
         self.manifold = self.model.manifold
+        self.c = float(self.manifold.c)  # curvature is not learnable; read it once
         self.cluster_loss = HyperbolicClusteringLoss(self.model.manifold, clustering_loss_margin)
         self.centri_loss = HyperbolicCentripetalLoss(self.model.manifold, centripetal_loss_margin)
         self.cluster_weight = clustering_loss_weight
@@ -65,9 +71,15 @@ class HierarchyTransformerLoss(torch.nn.Module):
         assert len(reps) == 3
         rep_anchor, rep_positive, rep_negative = reps
 
+        # share the hyperbolic distances and norms between clustering and centripetal losses
+        distances_positive, rep_anchor_hyper_norms, rep_positive_hyper_norms = poincare_dists(
+            rep_anchor, rep_positive, self.c
+        )
+        distances_negative = poincare_dist(rep_anchor, rep_negative, self.c)
+
         # compute and combine hyperbolic clustering and centripetal losses
-        cluster_loss = self.cluster_loss(rep_anchor, rep_positive, rep_negative)
-        centri_loss = self.centri_loss(rep_anchor, rep_positive, rep_negative)
+        cluster_loss = self.cluster_loss.margin_loss(distances_positive, distances_negative)
+        centri_loss = self.centri_loss.margin_loss(rep_anchor_hyper_norms, rep_positive_hyper_norms)
         combined_loss = self.cluster_weight * cluster_loss + self.centri_weight * centri_loss
 
         return {
@@ -103,6 +115,7 @@ class HyperbolicClusteringLoss(torch.nn.Module):
     def __init__(self, manifold: PoincareBall, margin: float):
         super().__init__()
         self.manifold = manifold
+        self.c = float(manifold.c)  # curvature is not learnable; read it once
         self.margin = margin
 
     def get_config_dict(self):
@@ -120,8 +133,17 @@ class HyperbolicClusteringLoss(torch.nn.Module):
             rep_positive (torch.Tensor): The input tensor for parent entities.
             rep_negative (torch.Tensor): The input tensor for negative parent entities.
         """
-        distances_positive = self.manifold.dist(rep_anchor, rep_positive)
-        distances_negative = self.manifold.dist(rep_anchor, rep_negative)
+        distances_positive = poincare_dist(rep_anchor, rep_positive, self.c)
+        distances_negative = poincare_dist(rep_anchor, rep_negative, self.c)
+        return self.margin_loss(distances_positive, distances_negative)
+
+    def margin_loss(self, distances_positive: torch.Tensor, distances_negative: torch.Tensor):
+        """Compute the loss from precomputed hyperbolic distances.
+
+        Args:
+            distances_positive (torch.Tensor): The hyperbolic distances between child and parent entities.
+            distances_negative (torch.Tensor): The hyperbolic distances between child and negative parent entities.
+        """
         cluster_triplet_loss = F.relu(distances_positive - distances_negative + self.margin)
         return cluster_triplet_loss.mean()
 
@@ -152,6 +174,7 @@ class HyperbolicCentripetalLoss(torch.nn.Module):
     def __init__(self, manifold: PoincareBall, margin: float):
         super().__init__()
         self.manifold = manifold
+        self.c = float(manifold.c)  # curvature is not learnable; read it once
         self.margin = margin
 
     def get_config_dict(self):
@@ -169,8 +192,17 @@ class HyperbolicCentripetalLoss(torch.nn.Module):
             rep_positive (torch.Tensor): The input tensor for parent entities.
             rep_negative (torch.Tensor): The input tensor for negative parent entities (actually not required in this loss).
         """
-        rep_anchor_hyper_norms = self.manifold.dist0(rep_anchor)
-        rep_positive_hyper_norms = self.manifold.dist0(rep_positive)
+        rep_anchor_hyper_norms = poincare_dist0(rep_anchor, self.c)
+        rep_positive_hyper_norms = poincare_dist0(rep_positive, self.c)
+        return self.margin_loss(rep_anchor_hyper_norms, rep_positive_hyper_norms)
+
+    def margin_loss(self, rep_anchor_hyper_norms: torch.Tensor, rep_positive_hyper_norms: torch.Tensor):
+        """Compute the loss from precomputed hyperbolic norms.
+
+        Args:
+            rep_anchor_hyper_norms (torch.Tensor): The hyperbolic norms of child entities.
+            rep_positive_hyper_norms (torch.Tensor): The hyperbolic norms of parent entities.
+        """
         # child further than parent w.r.t. origin
         centri_triplet_loss = F.relu(self.margin + rep_positive_hyper_norms - rep_anchor_hyper_norms)
         return centri_triplet_loss.mean()
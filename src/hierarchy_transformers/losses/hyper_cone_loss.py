@@ -20,6 +20,50 @@ from geoopt.manifolds import PoincareBall
 from hierarchy_transformers.utils import format_citation
 
 
+@torch.jit.script
+def _cone_inner_products(cone_tip: torch.Tensor, u: torch.Tensor):
+    """Squared norms of the cone tip and `u`, their dot product, and their squared (Euclidean) distance."""
+    sq_norm_tip = cone_tip.pow(2).sum(dim=-1)
+    sq_norm_u = u.pow(2).sum(dim=-1)
+    dot_prod = (cone_tip * u).sum(dim=-1)
+    sq_edist = (cone_tip - u).pow(2).sum(dim=-1)
+    return sq_norm_tip, sq_norm_u, dot_prod, sq_edist
+
+
+@torch.jit.script
+def _half_cone_aperture(sq_norm_tip: torch.Tensor, min_euclidean_norm: float, eps: float):
+    """Half cone aperture computed from the squared norm of the cone tip."""
+    # norm_tip = cone_tip.norm(dim=-1).clamp(min=self.min_euclidean_norm)  # to prevent undefined aperture
+    sq_norm_tip = sq_norm_tip.clamp(min=min_euclidean_norm + eps, max=1 - eps)
+    return torch.arcsin(min_euclidean_norm * (1 - sq_norm_tip) / torch.sqrt(sq_norm_tip)).clamp(
+        min=-1 + eps, max=1 - eps
+    )
+
+
+@torch.jit.script
+def _cone_angle_at_u(
+    sq_norm_tip: torch.Tensor, sq_norm_u: torch.Tensor, dot_prod: torch.Tensor, sq_edist: torch.Tensor, eps: float
+):
+    """Cone angle at `u` computed from the outputs of `_cone_inner_products`."""
+    # square root arguments are clamped so that neither values nor gradients become NaN near the domain edge
+    norm_tip = torch.sqrt(sq_norm_tip.clamp(min=eps * eps))
+    edist = torch.sqrt(sq_edist.clamp(min=eps * eps))  # euclidean distance
+    numerator = dot_prod * (1 + sq_norm_tip) - sq_norm_tip * (1 + sq_norm_u)
+    denominator = norm_tip * edist * torch.sqrt((1 + sq_norm_u * sq_norm_tip - 2 * dot_prod).clamp(min=eps * eps))
+    return torch.arccos((numerator / denominator.clamp(min=eps)).clamp(min=-1 + eps, max=1 - eps))
+
+
+@torch.jit.script
+def cone_energy(cone_tip: torch.Tensor, u: torch.Tensor, min_euclidean_norm: float, eps: float):
+    """Enery function of hyperbolic entailment cones, i.e., max(0, cone_angle(u) - half_cone_aperture) given a cone tip.
+
+    The shared reductions, the cone angle, the half cone aperture, and the `relu` are scripted as one function for kernel fusion.
+    """
+    sq_norm_tip, sq_norm_u, dot_prod, sq_edist = _cone_inner_products(cone_tip, u)
+    angle = _cone_angle_at_u(sq_norm_tip, sq_norm_u, dot_prod, sq_edist, eps)
+    return torch.relu(angle - _half_cone_aperture(sq_norm_tip, min_euclidean_norm, eps))
+
+
 class HyperbolicEntailmentConeLoss(torch.nn.Module):
     """Hyperbolic loss that construct entailment cones for entities.
 
@@ -48,36 +92,19 @@ class HyperbolicEntailmentConeLoss(torch.nn.Module):
         where x is the cone tip.
         """
         # cone tip means the point x is the tip of the hyperbolic cone
-        # norm_tip = cone_tip.norm(dim=-1).clamp(min=self.min_euclidean_norm)  # to prevent undefined aperture
-        sq_norm_tip = cone_tip.pow(2).sum(dim=-1).clamp(min=self.min_euclidean_norm + self.eps, max=1 - self.eps)
-        return torch.arcsin(self.min_euclidean_norm * (1 - sq_norm_tip) / torch.sqrt(sq_norm_tip)).clamp(
-            min=-1 + self.eps, max=1 - self.eps
-        )
+        sq_norm_tip = cone_tip.pow(2).sum(dim=-1)
+        return _half_cone_aperture(sq_norm_tip, float(self.min_euclidean_norm), float(self.eps))
 
     def cone_angle_at_u(self, cone_tip: torch.Tensor, u: torch.Tensor):
         """Angle between the axis [0, x] and the line [x, u]. This angle should be smaller than the
         half cone aperture at x for real children.
         """
         # parent point is treated as the cone tip
-        norm_tip = cone_tip.norm(2, dim=-1)
-        norm_child = u.norm(2, dim=-1)
-        dot_prod = (cone_tip * u).sum(dim=-1)
-        edist = (cone_tip - u).norm(2, dim=-1)  # euclidean distance
-        numerator = dot_prod * (1 + norm_tip**2) - norm_tip**2 * (1 + norm_child**2)
-        denominator = norm_tip * edist * torch.sqrt(1 + (norm_child**2) * (norm_tip**2) - 2 * dot_prod)
-
-        angle = torch.arccos((numerator / denominator.clamp(min=self.eps)).clamp(min=-1 + self.eps, max=1 - self.eps))
-        # Debugging step
-        if torch.isnan(angle).any():
-            print("Numerator:", numerator)
-            print("Denominator:", denominator)
-            print("Angle calculation resulted in NaNs")
-
-        return angle
+        return _cone_angle_at_u(*_cone_inner_products(cone_tip, u), float(self.eps))
 
     def energy(self, cone_tip: torch.Tensor, u: torch.Tensor):
         """Enery function defined as: max(0, cone_angle(u) - half_cone_aperture) given a cone tip."""
-        return F.relu(self.cone_angle_at_u(cone_tip, u) - self.half_cone_aperture(cone_tip))
+        return cone_energy(cone_tip, u, float(self.min_euclidean_norm), float(self.eps))
 
     def forward(self, rep_anchor: torch.Tensor, rep_other: torch.Tensor, labels: torch.Tensor):
         # anchors are children
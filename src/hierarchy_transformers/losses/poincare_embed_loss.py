@@ -39,7 +39,7 @@ class PoincareEmbeddingStaticLoss(torch.nn.Module):
     def forward(self, subject: torch.Tensor, objects: torch.Tensor):
         # first object is always the correct one
         pred_dists = self.manifold.dist(subject, objects)
-        correct_object_indices = torch.tensor([0] * len(pred_dists)).to(pred_dists.device)
+        correct_object_indices = torch.zeros(len(pred_dists), dtype=torch.long, device=pred_dists.device)
         return self.cross_entropy(-pred_dists, correct_object_indices)
 
     @property
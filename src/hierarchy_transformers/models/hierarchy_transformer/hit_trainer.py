@@ -37,11 +37,15 @@ class HierarchyTransformerTrainer(SentenceTransformerTrainer):
         outputs = None
         if return_outputs:
             loss_dict, outputs = loss_dict
+        # gather the loss values in a single device-to-host transfer
+        cluster_loss, centri_loss, combined_loss = (
+            torch.stack([loss_dict["cluster_loss"], loss_dict["centri_loss"], loss_dict["loss"]]).detach().tolist()
+        )
         self.log(
             {
-                "cluster_loss": round(loss_dict["cluster_loss"].item(), 4),
-                "centri_loss": round(loss_dict["centri_loss"].item(), 4),
-                "combined_loss": round(loss_dict["loss"].item(), 4),
+                "cluster_loss": round(cluster_loss, 4),
+                "centri_loss": round(centri_loss, 4),
+                "combined_loss": round(combined_loss, 4),
             }
         )
 
@@ -13,6 +13,8 @@
 # limitations under the License.
 from __future__ import annotations
 
+import math
+
 import torch
 from geoopt.manifolds import PoincareBall
 
@@ -24,6 +26,56 @@ def get_circum_poincareball(embed_dim: int) -> PoincareBall:
     return manifold
 
 
+@torch.jit.script
+def _poincare_dist_from_products(sq_norm_x: torch.Tensor, sq_norm_y: torch.Tensor, sq_dist_xy: torch.Tensor, c: float):
+    r"""Hyperbolic distance computed from the (Euclidean) squared norms and squared distance of two points.
+
+    It relies on the identity $\|(-x) \oplus_c y\|^2 = \|x - y\|^2 / (c\|x - y\|^2 + (1 - c\|x\|^2)(1 - c\|y\|^2))$,
+    whose denominator is a sum of non-negative terms and so does not cancel near the ball boundary.
+    """
+    sqrt_c = math.sqrt(c)
+    denom = (c * sq_dist_xy + (1 - c * sq_norm_x) * (1 - c * sq_norm_y)).clamp_min(1e-15)
+    mobius_norm = torch.sqrt(sq_dist_xy.clamp_min(1e-30) / denom)
+    return 2 / sqrt_c * torch.atanh((sqrt_c * mobius_norm).clamp(max=1 - 1e-7))
+
+
+@torch.jit.script
+def _poincare_dist0_from_sq_norm(sq_norm_x: torch.Tensor, c: float):
+    """Hyperbolic distance to the origin computed from the (Euclidean) squared norm of a point."""
+    sqrt_c = math.sqrt(c)
+    return 2 / sqrt_c * torch.atanh((sqrt_c * torch.sqrt(sq_norm_x.clamp_min(1e-30))).clamp(max=1 - 1e-7))
+
+
+@torch.jit.script
+def poincare_dist(x: torch.Tensor, y: torch.Tensor, c: float):
+    """Compute the hyperbolic distance between points in a Poincaré ball of curvature `-c`.
+
+    This is equivalent to `PoincareBall(c).dist(x, y)` but fused into a few reductions over the last dimension.
+    """
+    return _poincare_dist_from_products((x * x).sum(-1), (y * y).sum(-1), (x - y).pow(2).sum(-1), c)
+
+
+@torch.jit.script
+def poincare_dist0(x: torch.Tensor, c: float):
+    """Compute the hyperbolic distance between points and the origin of a Poincaré ball of curvature `-c`.
+
+    This is equivalent to `PoincareBall(c).dist0(x)`.
+    """
+    return _poincare_dist0_from_sq_norm((x * x).sum(-1), c)
+
+
+@torch.jit.script
+def poincare_dists(x: torch.Tensor, y: torch.Tensor, c: float):
+    """Compute `(dist(x, y), dist0(x), dist0(y))` in a Poincaré ball of curvature `-c` with shared reductions.
+
+    This is used for scoring and training on `(child, parent)` pairs where both the pairwise distance and the hyperbolic norms are required.
+    """
+    sq_norm_x = (x * x).sum(-1)
+    sq_norm_y = (y * y).sum(-1)
+    dists = _poincare_dist_from_products(sq_norm_x, sq_norm_y, (x - y).pow(2).sum(-1), c)
+    return dists, _poincare_dist0_from_sq_norm(sq_norm_x, c), _poincare_dist0_from_sq_norm(sq_norm_y, c)
+
+
 def project_onto_subspace(manifold: PoincareBall, point: torch.Tensor, normal: torch.Tensor):
     """Compute the (hyperbolic) projection of a point onto a subspace (a hyper-plane through origin) of the input manifold.
 
@@ -0,0 +1,76 @@
+# Copyright 2024 Yuan He
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import pytest
+import torch
+
+from hierarchy_transformers.evaluation import HierarchyTransformerEvaluator
+from hierarchy_transformers.models import HierarchyTransformer
+
+
+@pytest.fixture
+def model_path():
+    return "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@pytest.fixture
+def child_entities():
+    return ["personal computer", "berry", "laptop", "strawberry", "berry", "computer"]
+
+
+@pytest.fixture
+def parent_entities():
+    return ["computer", "fruit", "personal computer", "berry", "edible fruit", "machine"]
+
+
+def test_evaluator_encode(model_path, child_entities, parent_entities, monkeypatch):
+    model = HierarchyTransformer.from_pretrained(model_path)
+    # a small batch size to encode the (length-sorted) unique entities over several padded batches
+    evaluator = HierarchyTransformerEvaluator(
+        child_entities=child_entities,
+        parent_entities=parent_entities,
+        labels=[1, 1, 1, 1, 0, 1],
+        batch_size=3,
+    )
+
+    # Count tokenisation calls to check that the batches are cached
+    num_tokenize_calls = 0
+    tokenize = model.tokenize
+
+    def counting_tokenize(texts):
+        nonlocal num_tokenize_calls
+        num_tokenize_calls += 1
+        return tokenize(texts)
+
+    monkeypatch.setattr(model, "tokenize", counting_tokenize)
+
+    # Compare against the default encoding of sentence transformers
+    child_embeds, parent_embeds = evaluator.encode(model)
+    expected_child_embeds = model.encode(child_entities, convert_to_tensor=True)
+    expected_parent_embeds = model.encode(parent_entities, convert_to_tensor=True)
+    assert child_embeds.shape == expected_child_embeds.shape, "Child embeddings have an unexpected shape"
+    assert parent_embeds.shape == expected_parent_embeds.shape, "Parent embeddings have an unexpected shape"
+    assert torch.allclose(child_embeds, expected_child_embeds, atol=1e-4), "Child embeddings do not match"
+    assert torch.allclose(parent_embeds, expected_parent_embeds, atol=1e-4), "Parent embeddings do not match"
+
+    # A second call reuses the cached tokenised batches
+    num_tokenize_calls_first = num_tokenize_calls
+    assert num_tokenize_calls_first > 0, "Entities should be tokenised on the first call"
+    cached_batches = evaluator.tokenize(model)
+    child_embeds_again, parent_embeds_again = evaluator.encode(model)
+    assert num_tokenize_calls == num_tokenize_calls_first, "Entities should not be re-tokenised"
+    assert evaluator.tokenize(model) is cached_batches, "Tokenised batches should be cached"
+    assert torch.allclose(child_embeds_again, child_embeds), "Repeated encoding is inconsistent"
+    assert torch.allclose(parent_embeds_again, parent_embeds), "Repeated encoding is inconsistent"
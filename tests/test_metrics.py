@@ -17,7 +17,12 @@ import pytest
 import torch
 from geoopt.manifolds import PoincareBall
 
+from hierarchy_transformers.evaluation.metrics import evaluate_by_threshold, grid_search
+from hierarchy_transformers.losses import HyperbolicEntailmentConeLoss
 from hierarchy_transformers.models.hierarchy_transformer.hyperbolic import (
+    poincare_dist,
+    poincare_dist0,
+    poincare_dists,
     project_onto_subspace,
     reflect_about_subspace,
 )
@@ -78,3 +83,96 @@ def test_project_onto_subspace(manifold, sample_point, normal_vector):
     # Note: You may need to adjust this expected value based on the specifics of the PoincareBall manifold projection
     expected_projection = torch.tensor([0.27321523, 0.0000], dtype=torch.float32)
     assert torch.allclose(projection, expected_projection, atol=1e-6), "Projection values do not match expected values"
+
+
+@pytest.mark.parametrize("smaller_scores_better", [False, True])
+def test_grid_search(smaller_scores_better):
+    # Compare the vectorised grid search against a sequential threshold sweep
+    torch.manual_seed(0)
+    labels = torch.randint(0, 2, (500,))
+    scores = torch.randn(500) + (1 - 2 * smaller_scores_better) * labels
+
+    best_results = grid_search(
+        scores=scores,
+        labels=labels,
+        threshold_granularity=100,
+        smaller_scores_better=smaller_scores_better,
+        best_primary_metric_value=-1.0,
+    )
+
+    expected_results = None
+    best_f1 = -1.0
+    for threshold in range(int(scores.min() * 100), int(scores.max() * 100)):
+        results = evaluate_by_threshold(
+            scores=scores, labels=labels, threshold=threshold / 100, smaller_scores_better=smaller_scores_better
+        )
+        if results["f1"] >= best_f1:
+            expected_results = results
+            best_f1 = results["f1"]
+
+    assert best_results == expected_results, "Grid search results do not match the sequential threshold sweep"
+
+
+def test_poincare_dists():
+    # Compare the fused distance functions against geoopt
+    torch.manual_seed(0)
+    manifold = PoincareBall(c=1 / 16)
+    x = manifold.random_normal((32, 16), std=0.5)
+    y = manifold.random_normal((32, 16), std=0.5)
+    c = float(manifold.c)
+
+    dists, x_norms, y_norms = poincare_dists(x, y, c)
+    assert torch.allclose(dists, manifold.dist(x, y), atol=1e-4), "Distances do not match geoopt"
+    assert torch.allclose(x_norms, manifold.dist0(x), atol=1e-4), "Norms do not match geoopt"
+    assert torch.allclose(y_norms, manifold.dist0(y), atol=1e-4), "Norms do not match geoopt"
+    assert torch.allclose(poincare_dist(x, y, c), dists), "Distances are inconsistent"
+    assert torch.allclose(poincare_dist0(x, c), x_norms), "Norms are inconsistent"
+
+    # Near the ball boundary (c * |x|^2 = 0.999), compare float32 results against geoopt in float64
+    radius = (0.999 / c) ** 0.5
+    directions = torch.nn.functional.normalize(torch.randn(32, 16), dim=-1)
+    x = directions * radius
+    y = torch.nn.functional.normalize(directions + 0.01 * torch.randn(32, 16), dim=-1) * radius
+    dists, x_norms, y_norms = poincare_dists(x, y, c)
+    expected_dists = manifold.dist(x.double(), y.double()).float()
+    assert torch.allclose(dists, expected_dists, rtol=1e-3), "Near-boundary distances do not match geoopt"
+    assert torch.allclose(x_norms, manifold.dist0(x.double()).float(), rtol=1e-3), "Near-boundary norms do not match"
+    assert torch.allclose(y_norms, manifold.dist0(y.double()).float(), rtol=1e-3), "Near-boundary norms do not match"
+
+
+def test_cone_energy():
+    # Compare the scripted cone energy against the eager formula
+    torch.manual_seed(0)
+    cone_loss = HyperbolicEntailmentConeLoss(PoincareBall(c=1.0))
+    min_norm, eps = cone_loss.min_euclidean_norm, cone_loss.eps
+    directions = torch.nn.functional.normalize(torch.randn(2, 64, 16), dim=-1)
+    cone_tip, u = directions * torch.empty(2, 64, 1).uniform_(0.2, 0.9)
+
+    norm_tip = cone_tip.norm(2, dim=-1)
+    norm_child = u.norm(2, dim=-1)
+    dot_prod = (cone_tip * u).sum(dim=-1)
+    edist = (cone_tip - u).norm(2, dim=-1)
+    numerator = dot_prod * (1 + norm_tip**2) - norm_tip**2 * (1 + norm_child**2)
+    denominator = norm_tip * edist * torch.sqrt(1 + (norm_child**2) * (norm_tip**2) - 2 * dot_prod)
+    angle = torch.arccos((numerator / denominator.clamp(min=eps)).clamp(min=-1 + eps, max=1 - eps))
+    sq_norm_tip = cone_tip.pow(2).sum(dim=-1).clamp(min=min_norm + eps, max=1 - eps)
+    aperture = torch.arcsin(min_norm * (1 - sq_norm_tip) / torch.sqrt(sq_norm_tip)).clamp(min=-1 + eps, max=1 - eps)
+    expected_energy = torch.relu(angle - aperture)
+
+    assert torch.allclose(cone_loss.energy(cone_tip, u), expected_energy, atol=1e-5), "Energies do not match"
+    assert torch.allclose(cone_loss.cone_angle_at_u(cone_tip, u), angle, atol=1e-5), "Cone angles do not match"
+    assert torch.allclose(cone_loss.half_cone_aperture(cone_tip), aperture, atol=1e-5), "Apertures do not match"
+
+
+def test_cone_energy_degenerate():
+    # The energy at u == cone_tip should have finite values and gradients
+    cone_loss = HyperbolicEntailmentConeLoss(PoincareBall(c=1.0))
+    cone_tip = torch.tensor([[0.3, 0.3], [0.5, 0.0], [0.0, 0.0]], requires_grad=True)
+    u = cone_tip.detach().clone().requires_grad_(True)
+
+    energy = cone_loss.energy(cone_tip, u)
+    energy.sum().backward()
+
+    assert torch.isfinite(energy).all(), "Energy should be finite"
+    assert torch.isfinite(cone_tip.grad).all(), "Cone tip gradients should be finite"
+    assert torch.isfinite(u.grad).all(), "Gradients of u should be finite"
@@ -0,0 +1,53 @@
+# Copyright 2024 Yuan He
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import copy
+
+import pytest
+import torch
+
+from hierarchy_transformers.losses import HyperbolicEntailmentConeStaticLoss, PoincareEmbeddingStaticLoss
+from hierarchy_transformers.models import PoincareStaticEmbedding, PoincareStaticEmbeddingTrainer
+
+
+@pytest.mark.parametrize("loss_class", [PoincareEmbeddingStaticLoss, HyperbolicEntailmentConeStaticLoss])
+def test_compiled_training_step(loss_class):
+    # Smoke test that the compiled training step runs on CPU and matches the eager training step
+    torch.manual_seed(0)
+    model = PoincareStaticEmbedding([f"entity_{i}" for i in range(32)], embed_dim=8, init_weights=0.2)
+    # each example is (child, parent, negative_parents*)
+    train_dataset = torch.randint(0, 32, (16, 5)).tolist()
+
+    trainers = [
+        PoincareStaticEmbeddingTrainer(
+            model=trained_model,
+            train_dataset=train_dataset,
+            loss=loss_class(trained_model.manifold),
+            num_train_epochs=1,
+            train_batch_size=8,
+            warmup_epochs=0,
+            compile_mode=compile_mode,
+        )
+        for trained_model, compile_mode in [(model, None), (copy.deepcopy(model), "default")]
+    ]
+    eager_losses, compiled_losses = [
+        torch.stack([trainer.training_step(torch.tensor(train_dataset[i::2]), "cpu").detach() for i in range(2)])
+        for trainer in trainers
+    ]
+
+    assert torch.isfinite(compiled_losses).all(), "Compiled losses should be finite"
+    assert torch.allclose(compiled_losses, eager_losses, atol=1e-5), "Compiled losses do not match eager losses"
+    eager_weight, compiled_weight = [trainer.model.embed.weight for trainer in trainers]
+    assert torch.allclose(compiled_weight, eager_weight, atol=1e-5), "Compiled updates do not match eager updates"